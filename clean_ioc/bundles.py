@@ -1,24 +1,36 @@
+import itertools
 import logging
+import weakref
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from collections.abc import Hashable
 from typing import ClassVar
-from uuid import uuid4
 
 from clean_ioc import Container
 
 logger = logging.getLogger(__name__)
 
+_next_bundle_instance_id = itertools.count().__next__
+
 
 class BaseBundle(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def apply(self, container: Container): ...
 
     def __call__(self, container: Container):
-        self.apply(container=container)
+        self.apply(container)
 
 
 class RunOnceBundle(BaseBundle):
-    BUNDLE_RUN_HISTORY: ClassVar[dict[str, list[str]]] = defaultdict(list)
+    __slots__ = ()
+
+    BUNDLE_RUN_HISTORY: ClassVar[dict[Hashable, weakref.WeakSet[Container]]] = {}
+    _base_identifier: ClassVar[str]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._base_identifier = f"{cls.__module__}.{cls.__name__}"
 
     @abstractmethod
     def apply(self, container: Container): ...
@@ -26,35 +38,48 @@ class RunOnceBundle(BaseBundle):
     @abstractmethod
     def get_bundle_identifier(self) -> str: ...
 
-    def __call__(self, container: Container):
-        bundle_identifier = self.get_bundle_identifier()
-        bundle_containers = self.__class__.BUNDLE_RUN_HISTORY[bundle_identifier]
-        container_id = container.id
+    def get_bundle_key(self) -> Hashable:
+        """
+        The key the run history is stored under, defaults to the bundle identifier
+        """
+        return self.get_bundle_identifier()
 
-        if container_id in bundle_containers:
-            logging.warning(
-                "Bundle %s attempted to run more than once on container %s", bundle_identifier, container_id
+    def __call__(self, container: Container):
+        run_history = type(self).BUNDLE_RUN_HISTORY
+        bundle_key = self.get_bundle_key()
+        bundle_containers = run_history.get(bundle_key)
+        if bundle_containers is None:
+            # Containers drop out of the history once they are garbage collected
+            bundle_containers = run_history[bundle_key] = weakref.WeakSet()
+
+        if container in bundle_containers:
+            logger.warning(
+                "Bundle %s attempted to run more than once on container %s",
+                self.get_bundle_identifier(),
+                container.id,
             )
             return
 
-        self.apply(container=container)
-        bundle_containers.append(container_id)
+        self.apply(container)
+        bundle_containers.add(container)
 
 
 class OnlyRunOncePerInstanceBundle(RunOnceBundle):
+    __slots__ = ("_instance_id",)
+
+    _instance_id: int
+
     def __new__(cls, *args, **kwargs):
         instance = super().__new__(cls)
-        instance._instance_id = str(uuid4())  # type: ignore
+        instance._instance_id = _next_bundle_instance_id()
         return instance
 
     def get_bundle_identifier(self) -> str:
-        module = self.__class__.__module__
-        class_name = self.__class__.__name__
-        return f"{module}.{class_name}-{self._instance_id}"  # type: ignore
+        return f"{self._base_identifier}-{self._instance_id}"
 
 
 class OnlyRunOncePerClassBundle(RunOnceBundle):
+    __slots__ = ()
+
     def get_bundle_identifier(self) -> str:
-        module = self.__class__.__module__
-        class_name = self.__class__.__name__
-        return f"{module}.{class_name}"
+        return self._base_identifier
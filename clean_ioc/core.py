@@ -5,9 +5,12 @@ from __future__ import annotations
 import abc
 import asyncio
 import inspect
+import itertools
 import logging
+import threading
 import types
-from collections import defaultdict, deque
+import weakref
+from collections import deque
 from collections.abc import Callable, Collection, Iterable, MutableSequence, Sequence
 from contextlib import contextmanager
 from dataclasses import dataclass
@@ -24,7 +27,6 @@ from typing import Collection as TypingCollection
 from typing import Iterable as TypingIterable
 from typing import MutableSequence as TypingMutableSequence
 from typing import Sequence as TypingSequence
-from uuid import uuid4
 
 from theutilitybelt.functional.predicate import always_true
 from theutilitybelt.functional.utils import constant
@@ -35,15 +37,27 @@ from theutilitybelt.typing.generics import (
     is_generic_type_open,
     try_to_complete_generic,
 )
-from theutilitybelt.typing.utils import get_subclasses
 
-from clean_ioc.utils import singleton
+from clean_ioc.utils import get_subclasses, singleton
 
 from .type_filters import is_abstract, name_starts_with
 
 logger = logging.getLogger(__name__)
 
 TService = TypeVar("TService")
+TCached = TypeVar("TCached")
+
+_next_registration_id = itertools.count().__next__
+_next_scope_id = itertools.count().__next__
+
+_is_not_abstract = ~is_abstract
+_is_not_decorated_generic = ~name_starts_with("__DecoratedGeneric__")
+
+
+def _concrete_subclass_filter(subclass_type_filter: Callable[[type], bool]) -> Callable[[type], bool]:
+    if subclass_type_filter is always_true:
+        return _is_not_abstract
+    return _is_not_abstract & subclass_type_filter
 
 
 @singleton
@@ -62,6 +76,35 @@ EMPTY = _empty()
 UNKNOWN = _unknown()
 
 
+class _FrozenGenericTypeMap(GenericTypeMap):
+    """
+    A GenericTypeMap that can't be changed once built, so one instance can be shared by every node and registration
+    """
+
+    def __init__(self, cls: type):
+        self._frozen = False
+        super().__init__(cls)
+        self._frozen = True
+
+    def __setitem__(self, key: TypeVar | str, value: type | TypeVar):
+        if self._frozen:
+            raise TypeError("Generic type maps are shared and can't be changed")
+        super().__setitem__(key, value)
+
+
+_NO_GENERIC_MAPPING = _FrozenGenericTypeMap(_empty)
+
+
+_GENERIC_MAPPING_CACHE: weakref.WeakKeyDictionary[Callable, GenericTypeMap] = weakref.WeakKeyDictionary()
+
+
+def _get_generic_mapping(service_type: type) -> GenericTypeMap:
+    # Plain classes have no generic bases to walk, so they all share the empty mapping
+    if getattr(service_type, "__orig_bases__", None) is None and getattr(service_type, "__origin__", None) is None:
+        return _NO_GENERIC_MAPPING
+    return _get_cached_for_callable(_GENERIC_MAPPING_CACHE, service_type, lambda: _FrozenGenericTypeMap(service_type))
+
+
 def create_generic_decorator_type(concrete_decorator: type):
     return types.new_class(
         f"__DecoratedGeneric__{concrete_decorator.__name__}",
@@ -71,22 +114,67 @@ def create_generic_decorator_type(concrete_decorator: type):
 
 
 class ArgInfo:
+    __slots__ = ("name", "arg_type", "default_value")
+
     def __init__(self, name: str, arg_type: type, default_value: Any):
         self.name = name
         self.arg_type = arg_type
-        self.default_value = EMPTY if default_value == inspect._empty else default_value
+        self.default_value = EMPTY if default_value is inspect.Parameter.empty else default_value
+
+
+_VARIADIC_PARAMETER_KINDS = (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+
+# Values must never reference their key, otherwise the weak key would be kept alive by its own entry
+_ARG_INFO_CACHE: weakref.WeakKeyDictionary[Callable, tuple[ArgInfo, ...]] = weakref.WeakKeyDictionary()
 
 
-def _get_arg_info(subject: Callable, local_ns: dict = {}, global_ns: dict | None = None) -> dict[str, ArgInfo]:
+def _build_arg_info(subject: Callable, local_ns: dict, global_ns: dict | None) -> tuple[ArgInfo, ...]:
     arg_spec_fn = subject if inspect.isfunction(subject) else subject.__init__
     args = get_type_hints(arg_spec_fn, global_ns, local_ns)
     signature = inspect.signature(subject)
-    d: dict[str, ArgInfo] = {}
-    for name, param in signature.parameters.items():
-        if "*" in str(param):
-            continue
-        d[name] = ArgInfo(name=name, arg_type=args[name], default_value=param.default)
-    return d
+    return tuple(
+        ArgInfo(name=name, arg_type=args[name], default_value=param.default)
+        for name, param in signature.parameters.items()
+        if param.kind not in _VARIADIC_PARAMETER_KINDS
+    )
+
+
+def _get_cached_for_callable(
+    cache: weakref.WeakKeyDictionary[Callable, TCached], subject: Callable, build: Callable[[], TCached]
+) -> TCached:
+    try:
+        value = cache.get(subject)
+    except TypeError:
+        # Not hashable or not weak referenceable, so it can't be cached
+        return build()
+
+    # Built outside the try block so errors from introspection surface with a clean traceback
+    if value is None:
+        value = cache[subject] = build()
+    return value
+
+
+# Completing a generic walks the parent's generic bases, and the same (service type, parent) pairs recur
+_COMPLETED_GENERIC_CACHE: weakref.WeakKeyDictionary[Callable, dict[Any, Any]] = weakref.WeakKeyDictionary()
+
+
+def _complete_generic(service_type: Any, parent_implementation: type) -> Any:
+    completed = _get_cached_for_callable(_COMPLETED_GENERIC_CACHE, parent_implementation, dict)
+    try:
+        completed_type = completed.get(service_type, EMPTY)
+    except TypeError:
+        return try_to_complete_generic(service_type, parent_implementation)
+
+    if completed_type is EMPTY:
+        completed_type = completed[service_type] = try_to_complete_generic(service_type, parent_implementation)
+    return completed_type
+
+
+def _get_arg_info(subject: Callable, local_ns: dict = {}, global_ns: dict | None = None) -> tuple[ArgInfo, ...]:
+    if local_ns or global_ns is not None:
+        return _build_arg_info(subject, local_ns, global_ns)
+
+    return _get_cached_for_callable(_ARG_INFO_CACHE, subject, lambda: _build_arg_info(subject, local_ns, global_ns))
 
 
 def _set_up_dependencies(
@@ -94,20 +182,19 @@ def _set_up_dependencies(
     dependency_config: DependencyConfig,
 ) -> dict[str, Dependency]:
     args_infos = _get_arg_info(creator_function)
-    defaulted_dependency_config = defaultdict(DependencySettings, dependency_config)
 
     dependencies = {
-        name: Dependency(
-            name=name,
+        arg_info.name: Dependency(
+            name=arg_info.name,
             parent_implementation=creator_function,
             service_type=arg_info.arg_type,
-            settings=defaulted_dependency_config[name],
+            settings=dependency_config.get(arg_info.name) or _DEFAULT_DEPENDENCY_SETTINGS,
             default_value=arg_info.default_value,
         )
-        for name, arg_info in args_infos.items()
+        for arg_info in args_infos
     }
 
-    for extra_kwarg in set(defaulted_dependency_config.keys()) ^ set(dependencies.keys()):
+    for extra_kwarg in dependency_config.keys() - dependencies.keys():
         dependencies[extra_kwarg] = Dependency(
             name=extra_kwarg,
             parent_implementation=creator_function,
@@ -119,22 +206,57 @@ def _set_up_dependencies(
     return dependencies
 
 
-def _resolve_dependencies(
-    dependencies: dict[str, Dependency], context: _ResolvingContext, dependency_node: DependencyNode
-) -> dict[str, Any]:
-    kwargs = {}
-    for arg_name, arg_dep in dependencies.items():
-        kwargs[arg_name] = arg_dep.resolve(context, dependency_node)
-    return kwargs
+_RESOLVER_FACTORY_CACHE: dict[tuple[tuple[str, ...], bool], Callable[..., DependencyResolver]] = {}
+
+
+def _compile_resolver_factory(names: tuple[str, ...], is_async: bool) -> Callable[..., DependencyResolver]:
+    # Generates a resolver that builds the kwargs dict in a single literal, e.g. for names ("a", "b")
+    #   def resolve_dependencies(context, dependency_node):
+    #       return {'a': _r0(context, dependency_node), 'b': _r1(context, dependency_node)}
+    resolver_args = [f"_r{index}" for index in range(len(names))]
+    call_prefix = "await " if is_async else ""
+    def_prefix = "async def" if is_async else "def"
+    items = ", ".join(
+        f"{name!r}: {call_prefix}{resolver_arg}(context, dependency_node)"
+        for name, resolver_arg in zip(names, resolver_args)
+    )
+    source = (
+        f"def make_resolver({', '.join(resolver_args)}):\n"
+        f"    {def_prefix} resolve_dependencies(context, dependency_node):\n"
+        f"        return {{{items}}}\n"
+        f"    return resolve_dependencies\n"
+    )
+    namespace: dict[str, Any] = {}
+    exec(source, namespace)  # noqa: S102
+    return namespace["make_resolver"]
+
+
+def _compile_resolver(resolvers: tuple[Callable, ...], names: tuple[str, ...], is_async: bool) -> DependencyResolver:
+    key = (names, is_async)
+    factory = _RESOLVER_FACTORY_CACHE.get(key)
+    if factory is None:
+        factory = _RESOLVER_FACTORY_CACHE[key] = _compile_resolver_factory(names, is_async)
+    return factory(*resolvers)
+
+
+def _resolve_no_dependencies(context: _ResolvingContext, dependency_node: DependencyNode) -> dict[str, Any]:
+    return {}
+
 
+async def _resolve_no_dependencies_async(context: _ResolvingContext, dependency_node: DependencyNode) -> dict[str, Any]:
+    return {}
 
-async def _resolve_dependencies_async(
-    dependencies: dict[str, Dependency], context: _ResolvingContext, dependency_node: DependencyNode
-) -> dict[str, Any]:
-    kwargs = {}
-    for arg_name, arg_dep in dependencies.items():
-        kwargs[arg_name] = await arg_dep.resolve_async(context, dependency_node)
-    return kwargs
+
+def _bind_resolvers(dependencies: dict[str, Dependency]) -> DependencyResolver:
+    if not dependencies:
+        return _resolve_no_dependencies
+    return _compile_resolver(tuple(d.resolve for d in dependencies.values()), tuple(dependencies), is_async=False)
+
+
+def _bind_async_resolvers(dependencies: dict[str, Dependency]) -> DependencyResolver:
+    if not dependencies:
+        return _resolve_no_dependencies_async
+    return _compile_resolver(tuple(d.resolve_async for d in dependencies.values()), tuple(dependencies), is_async=True)
 
 
 def default_registration_filter(r: Registration) -> bool:
@@ -145,11 +267,71 @@ def default_parameter_value_factory(default_value: Any, _: DependencyContext) ->
     return default_value
 
 
+all_registrations = constant(True)
 default_parent_node_filter = constant(True)
 default_decorated_node_filter = constant(True)
 
 
-@dataclass
+def _filter_registrations(
+    registrations: Sequence[_Registration], registration_filter: RegistrationFilter, parent_node: Node
+) -> list[_Registration]:
+    if len(registrations) == 1:
+        r = registrations[0]
+        if _matches_registration_filter(registration_filter, r) and (
+            r.has_default_parent_node_filter or r.parent_node_filter(parent_node)
+        ):
+            return [r]
+        return []
+
+    if registration_filter is default_registration_filter:
+        return [
+            r
+            for r in registrations
+            if not r.is_named and (r.has_default_parent_node_filter or r.parent_node_filter(parent_node))
+        ]
+
+    if registration_filter is all_registrations:
+        return [r for r in registrations if r.has_default_parent_node_filter or r.parent_node_filter(parent_node)]
+
+    return [
+        r
+        for r in registrations
+        if registration_filter(r) and (r.has_default_parent_node_filter or r.parent_node_filter(parent_node))
+    ]
+
+
+def _matches_registration_filter(registration_filter: RegistrationFilter, registration: _Registration) -> bool:
+    if registration_filter is default_registration_filter:
+        return not registration.is_named
+    if registration_filter is all_registrations:
+        return True
+    return registration_filter(registration)
+
+
+def _chain_registrations(
+    registrations: Sequence[_Registration], from_parent: Sequence[_Registration]
+) -> Sequence[_Registration]:
+    if not registrations:
+        return from_parent
+    if not from_parent:
+        return registrations
+    return [*registrations, *from_parent]
+
+
+def _find_first_registration(
+    registrations: Iterable[_Registration], registration_filter: RegistrationFilter, parent_node: Node
+) -> _Registration | None:
+    is_default_filter = registration_filter is default_registration_filter
+    is_all_filter = registration_filter is all_registrations
+    for r in registrations:
+        if (is_all_filter or (not r.is_named if is_default_filter else registration_filter(r))) and (
+            r.has_default_parent_node_filter or r.parent_node_filter(parent_node)
+        ):
+            return r
+    return None
+
+
+@dataclass(slots=True)
 class Tag:
     name: str
     value: str | None = None
@@ -160,6 +342,23 @@ class Tag:
             yield self.value
 
 
+TagIndex = dict[str, set[str | None]]
+
+
+def _build_tag_index(tags: Iterable[Tag]) -> TagIndex:
+    index: TagIndex = {}
+    for t in tags:
+        index.setdefault(t.name, set()).add(t.value)
+    return index
+
+
+def _has_tag(index: TagIndex, name: str, value: str | None) -> bool:
+    values = index.get(name)
+    if not values:
+        return False
+    return value is None or value in values
+
+
 class Lifespan(IntEnum):
     transient = 0
     once_per_graph = 1
@@ -168,6 +367,8 @@ class Lifespan(IntEnum):
 
 
 class Node(Protocol):
+    __slots__ = ()
+
     service_type: type
     implementation: type | Callable
     parent: Node
@@ -204,7 +405,20 @@ class Node(Protocol):
 
 @singleton
 class EmptyNode(Node):
-    _GENERIC_MAPPING: GenericTypeMap | None = None
+    __slots__ = (
+        "service_type",
+        "implementation",
+        "parent",
+        "decorated",
+        "decorator",
+        "pre_configured_by",
+        "pre_configures",
+        "registration_name",
+        "registration_tags",
+        "instance",
+        "lifespan",
+        "children",
+    )
 
     def __init__(self):
         self.service_type = _empty
@@ -247,10 +461,7 @@ class EmptyNode(Node):
 
     @property
     def generic_mapping(self):
-        if not self.__class__._GENERIC_MAPPING:
-            self.__class__._GENERIC_MAPPING = GenericTypeMap(_empty)
-
-        return self.__class__._GENERIC_MAPPING
+        return _NO_GENERIC_MAPPING
 
     def has_dependant_service_type(self, service_type: type) -> bool:
         return False
@@ -265,7 +476,27 @@ class EmptyNode(Node):
         return "EmptyNode()"
 
 
+_EMPTY_NODE = EmptyNode()
+
+
 class DependencyNode(Node):
+    __slots__ = (
+        "service_type",
+        "implementation",
+        "lifespan",
+        "registration_name",
+        "registration_tags",
+        "parent",
+        "children",
+        "decorated",
+        "decorator",
+        "pre_configured_by",
+        "pre_configures",
+        "instance",
+        "_generic_mapping",
+        "_registration_tag_index",
+    )
+
     def __init__(
         self,
         service_type: type,
@@ -279,15 +510,16 @@ class DependencyNode(Node):
         self.lifespan = lifespan
         self.registration_name: str | None = registration_name
         self.registration_tags = registration_tags
-        self.parent = EmptyNode()
+        self.parent = _EMPTY_NODE
         self.children = []
-        self.decorated = EmptyNode()
-        self.decorator = EmptyNode()
-        self.pre_configured_by = EmptyNode()
-        self.pre_configures = EmptyNode()
+        self.decorated = _EMPTY_NODE
+        self.decorator = _EMPTY_NODE
+        self.pre_configured_by = _EMPTY_NODE
+        self.pre_configures = _EMPTY_NODE
         self.instance = UNKNOWN
 
         self._generic_mapping: GenericTypeMap | None = None
+        self._registration_tag_index: TagIndex | None = None
 
     def set_instance(self, instance: Any):
         if self.instance is UNKNOWN:
@@ -311,19 +543,19 @@ class DependencyNode(Node):
         pre_configuration_node.pre_configures = self
 
     def has_registration_tag(self, name: str, value: str | None):
-        if value is not None:
-            return any(t.name == name and t.value == value for t in self.registration_tags)
+        if self._registration_tag_index is None:
+            self._registration_tag_index = _build_tag_index(self.registration_tags)
 
-        return any(t.name == name for t in self.registration_tags)
+        return _has_tag(self._registration_tag_index, name, value)
 
     def unparent(self):
-        self.parent = EmptyNode()
+        self.parent = _EMPTY_NODE
         if decorated := self.decorated:
             decorated.unparent()
 
         if pre_configures := self.pre_configured_by:
-            pre_configures.pre_configures = EmptyNode()
-            self.pre_configured_by = EmptyNode()
+            pre_configures.pre_configures = _EMPTY_NODE
+            self.pre_configured_by = _EMPTY_NODE
 
     @property
     def implementation_type(self):
@@ -348,7 +580,7 @@ class DependencyNode(Node):
     @property
     def generic_mapping(self):
         if not self._generic_mapping:
-            self._generic_mapping = GenericTypeMap(self.service_type)
+            self._generic_mapping = _get_generic_mapping(self.service_type)
 
         return self._generic_mapping
 
@@ -381,15 +613,12 @@ class DependencyNode(Node):
 
 
 class DependencyGraph(DependencyNode):
-    def __init__(self, service_type: type, filter: RegistrationFilter):
-        dependency_settings = DependencySettings(filter=filter)
-        self.root_dependency = Dependency(
-            name="__ROOT__",
-            parent_implementation=DependencyGraph,
-            service_type=service_type,
-            settings=dependency_settings,
-            default_value=EMPTY,
-        )
+    __slots__ = ("root_dependency",)
+
+    def __init__(self, service_type: type, filter: RegistrationFilter, root_dependency: Dependency | None = None):
+        if root_dependency is None:
+            root_dependency = _create_root_dependency(service_type, filter)
+        self.root_dependency = root_dependency
 
         super().__init__(
             service_type=service_type,
@@ -408,7 +637,19 @@ class DependencyGraph(DependencyNode):
         return self
 
 
+def _create_root_dependency(service_type: type, filter: RegistrationFilter) -> Dependency:
+    return Dependency(
+        name="__ROOT__",
+        parent_implementation=DependencyGraph,
+        service_type=service_type,
+        settings=_dependency_settings_with_filter(filter),
+        default_value=EMPTY,
+    )
+
+
 class DependencyContext:
+    __slots__ = ("name", "service_type", "implementation", "parent", "decorated")
+
     def __init__(self, name: str, dependency_node: DependencyNode):
         self.name = name
         self.service_type = dependency_node.service_type
@@ -418,6 +659,8 @@ class DependencyContext:
 
 
 class CurrentGraph:
+    __slots__ = ("parent_node", "resolving_context")
+
     def __init__(self, parent_node: DependencyNode, resolving_context: _ResolvingContext):
         self.parent_node = parent_node
         self.resolving_context = resolving_context
@@ -431,7 +674,7 @@ class CurrentGraph:
             lifespan=Lifespan.transient,
         )
         self.parent_node.add_child(current_graph_node)
-        dependency_settings = DependencySettings(filter=filter)
+        dependency_settings = _dependency_settings_with_filter(filter)
 
         dependency = Dependency(
             name="__CURRENT_GRAPH__",
@@ -485,23 +728,19 @@ class CannotResolveError(Exception):
 
     @property
     def dependency_chain(self):
-        chain = ""
         arrow = "↑\n↑\n↑\n"
-
-        for index, item in enumerate(self.dependencies):
-            printer_item = CannotResolveError.print_dependency(item)
-            if index == 0:
-                chain += f"{printer_item}\n"
-            else:
-                # Adding fixed spacing before arrow for alignment, then adding the dependency
-                chain += f"{arrow}{printer_item}\n"
-
-        return chain
+        return arrow.join(f"{CannotResolveError.print_dependency(item)}\n" for item in self.dependencies)
 
     def __str__(self):
         return f"\n{self.message}\n\nDependency chain:\n{self.dependency_chain}"
 
 
+_RESOLVE_SINGLE = 0
+_RESOLVE_COLLECTION = 1
+_RESOLVE_DEPENDENCY_CONTEXT = 2
+_RESOLVE_CURRENT_GRAPH = 3
+
+
 class Dependency:
     GENERIC_COLLECTION_MAPPINGS: ClassVar[dict[type, type]] = {
         tuple: tuple,
@@ -525,7 +764,12 @@ class Dependency:
         "default_value",
         "is_dependency_context",
         "generic_collection_type",
+        "collection_item_type",
         "is_current_graph",
+        "resolve_mode",
+        "_resolve_strategy",
+        "_resolve_async_strategy",
+        "_has_default_value_factory",
     )
 
     def __init__(
@@ -541,109 +785,164 @@ class Dependency:
 
         self.name = name
         self.parent_implementation = parent_implementation
-        if isinstance(parent_implementation, type):
-            self.service_type = try_to_complete_generic(service_type, parent_implementation)
+        # Only generic aliases with unbound type variables can be completed from the parent class
+        if isinstance(parent_implementation, type) and getattr(service_type, "__parameters__", None):
+            self.service_type = _complete_generic(service_type, parent_implementation)
         else:
             self.service_type = service_type
         self.settings = settings
+        self._has_default_value_factory = settings.value_factory is default_parameter_value_factory
         generic_origin = getattr(self.service_type, "__origin__", None)
+        generic_collection_type = (
+            self.GENERIC_COLLECTION_MAPPINGS.get(generic_origin) if generic_origin is not None else None
+        )
+        # Bare aliases such as typing.List have no item type, and tuple[()] has an empty one
+        collection_args = getattr(self.service_type, "__args__", ()) if generic_collection_type is not None else ()
 
-        if generic_origin and generic_origin in self.GENERIC_COLLECTION_MAPPINGS:
-            self.generic_collection_type = self.GENERIC_COLLECTION_MAPPINGS[generic_origin]
+        if collection_args:
+            self.generic_collection_type = generic_collection_type
+            self.collection_item_type = collection_args[0]
         else:
             self.generic_collection_type = None
+            self.collection_item_type = None
 
         self.default_value = default_value
 
-        if self.service_type == DependencyContext:
+        if self.service_type is DependencyContext:
             self.is_dependency_context = True
-        elif self.service_type == CurrentGraph:
+            self.resolve_mode = _RESOLVE_DEPENDENCY_CONTEXT
+            self._resolve_strategy = Dependency._resolve_dependency_context
+            self._resolve_async_strategy = None
+        elif self.service_type is CurrentGraph:
             self.is_current_graph = True
+            self.resolve_mode = _RESOLVE_CURRENT_GRAPH
+            self._resolve_strategy = Dependency._resolve_current_graph
+            self._resolve_async_strategy = None
+        elif self.generic_collection_type:
+            self.resolve_mode = _RESOLVE_COLLECTION
+            self._resolve_strategy = Dependency._resolve_collection
+            self._resolve_async_strategy = Dependency._resolve_collection_async
+        else:
+            self.resolve_mode = _RESOLVE_SINGLE
+            self._resolve_strategy = Dependency._resolve_single
+            self._resolve_async_strategy = Dependency._resolve_single_async
 
-    def resolve(self, context: _ResolvingContext, dependency_node: DependencyNode) -> Any:
-        dependency_context = DependencyContext(name=self.name, dependency_node=dependency_node)
-        value = self.settings.value_factory(self.default_value, dependency_context)
-
-        if value is not EMPTY:
-            return value
-
-        if self.is_dependency_context:
-            return dependency_context
-
-        if self.is_current_graph:
-            return CurrentGraph(parent_node=dependency_node, resolving_context=context)
-
-        if self.generic_collection_type:
-            regs = context.find_registrations(
-                service_type=self.service_type.__args__[0],  # type: ignore
-                registration_filter=self.settings.filter,
-                parent_node=dependency_node,
-            )
-            sequence_node = DependencyNode(
-                service_type=self.service_type,
-                implementation=self.generic_collection_type,
-                lifespan=Lifespan.transient,
-            )
-
-            dependency_node.add_child(sequence_node)
-
-            generator = (r.build(context, sequence_node) for r in regs)
-            collection = self.generic_collection_type(generator)
-            sequence_node.set_instance(collection)
+    def _create_collection_node(self, dependency_node: DependencyNode) -> DependencyNode:
+        sequence_node = DependencyNode(
+            service_type=self.service_type,
+            implementation=self.generic_collection_type,  # type: ignore
+            lifespan=Lifespan.transient,
+        )
+        dependency_node.add_child(sequence_node)
+        return sequence_node
 
-            return collection
+    def _resolve_single(
+        self, context: _ResolvingContext, dependency_node: DependencyNode, dependency_context: DependencyContext | None
+    ) -> Any:
         try:
             reg = context.find_registration(
                 service_type=self.service_type,
                 registration_filter=self.settings.filter,
                 parent_node=dependency_node,
             )
+            if reg is None:
+                raise CannotResolveError()
             return reg.build(context, dependency_node)
         except CannotResolveError as ex:
             ex.append(self)
             raise ex
 
-    async def resolve_async(self, context: _ResolvingContext, dependency_node: DependencyNode) -> Any:
-        dependency_context = DependencyContext(name=self.name, dependency_node=dependency_node)
-        value = self.settings.value_factory(self.default_value, dependency_context)
-
-        if value is not EMPTY:
-            return value
-
-        if self.is_dependency_context:
-            return DependencyContext(name=self.name, dependency_node=dependency_node)
-
-        if self.generic_collection_type:
-            regs = context.find_registrations(
-                service_type=self.service_type.__args__[0],  # type: ignore
-                registration_filter=self.settings.filter,
-                parent_node=dependency_node,
-            )
-            sequence_node = DependencyNode(
-                service_type=self.service_type,
-                implementation=self.generic_collection_type,
-                lifespan=Lifespan.transient,
-            )
-
-            dependency_node.add_child(sequence_node)
+    def _resolve_collection(
+        self, context: _ResolvingContext, dependency_node: DependencyNode, dependency_context: DependencyContext | None
+    ) -> Any:
+        regs = context.find_registrations(
+            service_type=self.collection_item_type,  # type: ignore
+            registration_filter=self.settings.filter,
+            parent_node=dependency_node,
+        )
+        sequence_node = self._create_collection_node(dependency_node)
+        generator = (r.build(context, sequence_node) for r in regs)
+        collection = self.generic_collection_type(generator)  # type: ignore
+        sequence_node.set_instance(collection)
 
-            generator = (r.build_async(context, sequence_node) for r in regs)
-            items = await asyncio.gather(*generator)
-            collection = self.generic_collection_type(items)
-            sequence_node.set_instance(collection)
+        return collection
 
-            return collection
+    async def _resolve_single_async(
+        self, context: _ResolvingContext, dependency_node: DependencyNode, dependency_context: DependencyContext | None
+    ) -> Any:
         try:
             reg = context.find_registration(
                 service_type=self.service_type,
                 registration_filter=self.settings.filter,
                 parent_node=dependency_node,
             )
+            if reg is None:
+                raise CannotResolveError()
             return await reg.build_async(context, dependency_node)
         except CannotResolveError as ex:
             ex.append(self)
             raise ex
 
+    async def _resolve_collection_async(
+        self, context: _ResolvingContext, dependency_node: DependencyNode, dependency_context: DependencyContext | None
+    ) -> Any:
+        regs = context.find_registrations(
+            service_type=self.collection_item_type,  # type: ignore
+            registration_filter=self.settings.filter,
+            parent_node=dependency_node,
+        )
+        sequence_node = self._create_collection_node(dependency_node)
+        generator = (r.build_async(context, sequence_node) for r in regs)
+        items = await asyncio.gather(*generator)
+        collection = self.generic_collection_type(items)  # type: ignore
+        sequence_node.set_instance(collection)
+
+        return collection
+
+    def _resolve_dependency_context(
+        self, context: _ResolvingContext, dependency_node: DependencyNode, dependency_context: DependencyContext | None
+    ) -> Any:
+        if dependency_context is None:
+            return DependencyContext(name=self.name, dependency_node=dependency_node)
+        return dependency_context
+
+    def _resolve_current_graph(
+        self, context: _ResolvingContext, dependency_node: DependencyNode, dependency_context: DependencyContext | None
+    ) -> Any:
+        return CurrentGraph(parent_node=dependency_node, resolving_context=context)
+
+    def resolve(self, context: _ResolvingContext, dependency_node: DependencyNode) -> Any:
+        # The default value factory just hands back the default, so it needs no call and no dependency context
+        if self._has_default_value_factory:
+            value = self.default_value
+            dependency_context = None
+        else:
+            dependency_context = DependencyContext(name=self.name, dependency_node=dependency_node)
+            value = self.settings.value_factory(self.default_value, dependency_context)
+
+        if value is not EMPTY:
+            return value
+
+        # The strategy is picked once in __init__ and stored as a plain function in a slot
+        return self._resolve_strategy(self, context, dependency_node, dependency_context)
+
+    async def resolve_async(self, context: _ResolvingContext, dependency_node: DependencyNode) -> Any:
+        if self._has_default_value_factory:
+            value = self.default_value
+            dependency_context = None
+        else:
+            dependency_context = DependencyContext(name=self.name, dependency_node=dependency_node)
+            value = self.settings.value_factory(self.default_value, dependency_context)
+
+        if value is not EMPTY:
+            return value
+
+        # Dependency contexts and current graphs never await, so they share the sync strategy
+        async_strategy = self._resolve_async_strategy
+        if async_strategy is None:
+            return self._resolve_strategy(self, context, dependency_node, dependency_context)
+        return await async_strategy(self, context, dependency_node, dependency_context)
+
 
 class Activator(abc.ABC):
     @classmethod
@@ -763,6 +1062,19 @@ class AsyncGeneratorActivator(Activator):
         return instance
 
 
+_ACTIVATOR_CLASS_CACHE: weakref.WeakKeyDictionary[Callable, type[Activator]] = weakref.WeakKeyDictionary()
+
+
+def _find_activator_class(creator_function: Callable) -> type[Activator]:
+    if inspect.iscoroutinefunction(creator_function):
+        return AsyncFactoryActivator
+    if inspect.isasyncgenfunction(creator_function):
+        return AsyncGeneratorActivator
+    if inspect.isgeneratorfunction(creator_function):
+        return GeneratorActivator
+    return FactoryActivator
+
+
 class PreConfiguration:
     __slots__ = (
         "configuration_fn",
@@ -770,6 +1082,8 @@ class PreConfiguration:
         "registration_filter",
         "has_run",
         "dependencies",
+        "resolvers",
+        "async_resolvers",
         "continue_on_failure",
     )
 
@@ -785,6 +1099,8 @@ class PreConfiguration:
         self.activator_class = activator_class
         self.registration_filter = registration_filter
         self.dependencies = _set_up_dependencies(pre_configuration, dependency_config)
+        self.resolvers = _bind_resolvers(self.dependencies)
+        self.async_resolvers = _bind_async_resolvers(self.dependencies)
         self.continue_on_failure = continue_on_failure
         self.has_run = False
 
@@ -794,17 +1110,17 @@ class PreConfiguration:
             yield
             self.has_run = True
         except Exception as ex:
-            logger.exception(f"Failed to run pre-configuration {self.configuration_fn}")
+            logger.exception("Failed to run pre-configuration %s", self.configuration_fn)
             if not self.continue_on_failure:
                 raise ex
 
     def run(self, context: _ResolvingContext, dependency_node: DependencyNode):
-        resolved_dependencies = _resolve_dependencies(self.dependencies, context, dependency_node)
+        resolved_dependencies = self.resolvers(context, dependency_node)
         with self._run_safely():
             self.activator_class.activate(self.configuration_fn, resolved_dependencies, context, Lifespan.scoped)
 
     async def run_async(self, context: _ResolvingContext, dependency_node: DependencyNode):
-        resolved_dependencies = await _resolve_dependencies_async(self.dependencies, context, dependency_node)
+        resolved_dependencies = await self.async_resolvers(context, dependency_node)
         with self._run_safely():
             await self.activator_class.activate_async(
                 self.configuration_fn, resolved_dependencies, context, Lifespan.scoped
@@ -815,11 +1131,14 @@ class Decorator:
     __slots__ = (
         "service_type",
         "decorated_node_filter",
+        "has_default_decorated_node_filter",
         "parent_node_filter",
         "decorator_type",
         "decorated_arg",
         "registration_filter",
         "dependencies",
+        "resolvers",
+        "async_resolvers",
         "activator_class",
         "position",
     )
@@ -846,17 +1165,20 @@ class Decorator:
         )
         self.registration_filter = registration_filter
         self.decorated_node_filter = decorator_node_filter
+        self.has_default_decorated_node_filter = decorator_node_filter is default_decorated_node_filter
         self.activator_class = activator_class
         self.position = position
 
         del dependencies[self.decorated_arg]
 
         self.dependencies: dict[str, Dependency] = dependencies
+        self.resolvers = _bind_resolvers(dependencies)
+        self.async_resolvers = _bind_async_resolvers(dependencies)
 
     def decorate(
         self, instance: Any, context: _ResolvingContext, dependency_node: DependencyNode, registration: Registration
     ):
-        resolved_dependencies = _resolve_dependencies(self.dependencies, context, dependency_node)
+        resolved_dependencies = self.resolvers(context, dependency_node)
         resolved_dependencies[self.decorated_arg] = instance
 
         return self.activator_class.activate(
@@ -866,7 +1188,7 @@ class Decorator:
     async def decorate_async(
         self, instance: Any, context: _ResolvingContext, dependency_node: DependencyNode, registration: Registration
     ):
-        resolved_dependencies = await _resolve_dependencies_async(self.dependencies, context, dependency_node)
+        resolved_dependencies = await self.async_resolvers(context, dependency_node)
         resolved_dependencies[self.decorated_arg] = instance
 
         return await self.activator_class.activate_async(
@@ -875,6 +1197,8 @@ class Decorator:
 
 
 class Registration(Protocol):
+    __slots__ = ()
+
     service_type: type
     implementation: Callable
     lifespan: Lifespan
@@ -891,15 +1215,20 @@ class _Registration(Registration):
         "service_type",
         "implementation",
         "lifespan",
+        "is_cached",
         "name",
         "parent_node_filter",
+        "has_default_parent_node_filter",
         "tags",
+        "_tag_index",
         "scoped_teardown",
         "id",
         "was_used",
         "is_named",
         "_generic_mapping",
         "dependencies",
+        "resolvers",
+        "async_resolvers",
         "activator_class",
     )
 
@@ -915,6 +1244,7 @@ class _Registration(Registration):
         parent_node_filter: NodeFilter = default_parent_node_filter,
         tags: Iterable[Tag] | None = None,
         scoped_teardown: Callable | None = None,
+        dependencies: dict[str, Dependency] | None = None,
     ):
         if scoped_teardown and not lifespan <= Lifespan.scoped:
             raise ValueError("Scoped teardowns can only be used with scoped and singleton lifestyles")
@@ -922,37 +1252,40 @@ class _Registration(Registration):
         self.service_type = service_type
         self.implementation = implementation
         self.activator_class = activator_class
-        self.lifespan = lifespan
+        self.lifespan = Lifespan(lifespan)
+        self.is_cached = self.lifespan >= Lifespan.once_per_graph
         self.name = name
         self.tags = tuple(tags) if tags else tuple()
-        self.id = str(uuid4())
+        self._tag_index = _build_tag_index(self.tags)
+        self.id = _next_registration_id()
         self.parent_node_filter = parent_node_filter
+        self.has_default_parent_node_filter = parent_node_filter is default_parent_node_filter
         self.scoped_teardown = scoped_teardown
         self.was_used = False
         self.is_named = name is not None
-        self.dependencies: dict[str, Dependency] = _set_up_dependencies(implementation, dependency_config)
+        self.dependencies: dict[str, Dependency] = (
+            _set_up_dependencies(implementation, dependency_config) if dependencies is None else dependencies
+        )
+        self.resolvers = _bind_resolvers(self.dependencies)
+        self.async_resolvers = _bind_async_resolvers(self.dependencies)
 
         self._generic_mapping: GenericTypeMap | None = None
 
     def has_tag(self, name: str, value: str | None):
-        if value is not None:
-            return any(t.name == name and t.value == value for t in self.tags)
-
-        return any(t.name == name for t in self.tags)
+        return _has_tag(self._tag_index, name, value)
 
     @property
     def generic_mapping(self):
         if not self._generic_mapping:
-            self._generic_mapping = GenericTypeMap(self.service_type)
+            self._generic_mapping = _get_generic_mapping(self.service_type)
 
         return self._generic_mapping
 
-    def _try_find_cached_node(self, context: _ResolvingContext, parent_node: DependencyNode):
+    def _try_find_cached_node(self, context: _ResolvingContext, parent_node: DependencyNode) -> DependencyNode | None:
         cached_node = context.get_cached(self.id)
-        if cached_node:
+        if cached_node is not None:
             parent_node.add_child(cached_node)
-            return cached_node.instance
-        return None
+        return cached_node
 
     def _create_new_dependency_node(self, parent_node: DependencyNode):
         new_instance_node = DependencyNode(
@@ -962,13 +1295,16 @@ class _Registration(Registration):
             registration_name=self.name,
             registration_tags=self.tags,
         )
+        new_instance_node._registration_tag_index = self._tag_index
 
         parent_node.add_child(new_instance_node)
         return new_instance_node
 
     def build(self, context: _ResolvingContext, parent_node: DependencyNode):
-        if cached_node := self._try_find_cached_node(context, parent_node):
-            return cached_node
+        # Transient instances are never cached, so they skip both the lookup and the store
+        is_cached = self.is_cached
+        if is_cached and (cached_node := self._try_find_cached_node(context, parent_node)) is not None:
+            return cached_node.instance
 
         new_instance_node = self._create_new_dependency_node(parent_node)
 
@@ -985,7 +1321,8 @@ class _Registration(Registration):
             pre_configuration.run(context, pre_configuration_node)
             pre_configuration_node.set_instance(pre_configuration)
 
-        resolved_dependencies = _resolve_dependencies(self.dependencies, context, new_instance_node)
+        # Instances and parameterless implementations skip the resolver call altogether
+        resolved_dependencies = self.resolvers(context, new_instance_node)
 
         built_instance = self.activator_class.activate(
             self.implementation, resolved_dependencies, context, lifespan=self.lifespan
@@ -1004,13 +1341,15 @@ class _Registration(Registration):
             next_decorated_node.set_instance(built_instance)
             top_decorated_node = next_decorated_node
 
-        context.new_instance_created(self, top_decorated_node)
+        if is_cached:
+            context.new_instance_created(self, top_decorated_node)
         self.was_used = True
         return built_instance
 
     async def build_async(self, context: _ResolvingContext, parent_node: DependencyNode):
-        if cached_node := self._try_find_cached_node(context, parent_node):
-            return cached_node
+        is_cached = self.is_cached
+        if is_cached and (cached_node := self._try_find_cached_node(context, parent_node)) is not None:
+            return cached_node.instance
 
         new_instance_node = self._create_new_dependency_node(parent_node)
 
@@ -1027,7 +1366,7 @@ class _Registration(Registration):
             await pre_configuration.run_async(context, pre_configuration_node)
             pre_configuration_node.set_instance(pre_configuration)
 
-        resolved_dependencies = await _resolve_dependencies_async(self.dependencies, context, new_instance_node)
+        resolved_dependencies = await self.async_resolvers(context, new_instance_node)
         built_instance = await self.activator_class.activate_async(
             self.implementation, resolved_dependencies, context, lifespan=self.lifespan
         )
@@ -1046,7 +1385,8 @@ class _Registration(Registration):
             next_decorated_node.set_instance(built_instance)
             top_decorated_node = next_decorated_node
 
-        context.new_instance_created(self, top_decorated_node)
+        if is_cached:
+            context.new_instance_created(self, top_decorated_node)
         self.was_used = True
         return built_instance
 
@@ -1054,6 +1394,8 @@ class _Registration(Registration):
 class _DecoratorStore:
     def __init__(self):
         self._decorators: list[tuple[int, Decorator]] = []
+        # Rebuilt on add and only ever read, so it can be handed out without copying
+        self.decorators: tuple[Decorator, ...] = ()
         self.next_index = 0
 
     @classmethod
@@ -1066,78 +1408,52 @@ class _DecoratorStore:
         self._decorators.append((self.next_index, decorator))
         self.next_index += 1
         self._decorators.sort(key=self.sort_key)
+        self.decorators = tuple(decorator for _, decorator in self._decorators)
 
     def __len__(self):
-        return len(self._decorators)
+        return len(self.decorators)
 
     def __iter__(self):
-        for _, decorator in self._decorators:
-            yield decorator
+        return iter(self.decorators)
 
 
 class _Registry:
     def __init__(self):
-        self._registrations: dict[type, deque[_Registration]] = defaultdict(deque)
-        self._decorators: dict[type, _DecoratorStore] = defaultdict(_DecoratorStore)
-        self._pre_configurations: dict[type, deque[PreConfiguration]] = defaultdict(deque)
-
-    def register_implementation(
-        self,
-        *,
-        service_type: type[TService],
-        implementation: type[TService],
-        lifespan: Lifespan,
-        name: str | None,
-        dependency_config: DependencyConfig,
-        tags: Iterable[Tag] | None,
-        parent_node_filter: NodeFilter,
-        scoped_teardown: Callable[[TService], Any] | None,
-    ):
-        registration = _Registration(
-            activator_class=FactoryActivator,
-            service_type=service_type,
-            implementation=implementation,
-            lifespan=lifespan,
-            name=name,
-            dependency_config=dependency_config,
-            parent_node_filter=parent_node_filter,
-            scoped_teardown=scoped_teardown,
-            tags=tags,
-        )
-
-        self._registrations[service_type].appendleft(registration)
-        self._registrations[implementation].appendleft(registration)
+        # Newest first, each tuple is replaced rather than mutated so readers never need the lock
+        self._registrations: dict[type, tuple[_Registration, ...]] = {}
+        # The default filter only accepts unnamed registrations, so they get their own index
+        self._unnamed_registrations: dict[type, tuple[_Registration, ...]] = {}
+        # Guards every read-modify-write of the registration, decorator and pre-configuration tables
+        self._write_lock = threading.Lock()
+        # Bumped on every added registration so caches of resolved instances can tell when they may be stale
+        self.registrations_version = 0
+        self._decorators: dict[type, _DecoratorStore] = {}
+        # Newest first, replaced on add like the registrations
+        self._pre_configurations: dict[type, tuple[PreConfiguration, ...]] = {}
+
+    def _add_registration(self, service_type: type, registration: _Registration):
+        with self._write_lock:
+            self._registrations[service_type] = (registration, *self._registrations.get(service_type, ()))
+            if not registration.is_named:
+                self._unnamed_registrations[service_type] = (
+                    registration,
+                    *self._unnamed_registrations.get(service_type, ()),
+                )
+            self.registrations_version += 1
 
-    def register_concrete(
-        self,
-        *,
-        service_type: type[TService],
-        lifespan: Lifespan,
-        name: str | None,
-        dependency_config: DependencyConfig,
-        tags: Iterable[Tag] | None,
-        parent_node_filter: NodeFilter,
-        scoped_teardown: Callable[[TService], Any] | None,
-    ):
-        registration = _Registration(
-            activator_class=FactoryActivator,
-            service_type=service_type,
-            implementation=service_type,
-            lifespan=lifespan,
-            name=name,
-            dependency_config=dependency_config,
-            parent_node_filter=parent_node_filter,
-            scoped_teardown=scoped_teardown,
-            tags=tags,
+    @classmethod
+    def _get_activator_class(cls, creator_function: Callable) -> type[Activator]:
+        return _get_cached_for_callable(
+            _ACTIVATOR_CLASS_CACHE, creator_function, lambda: _find_activator_class(creator_function)
         )
 
-        self._registrations[service_type].appendleft(registration)
-
-    def register_instance(
+    def register(
         self,
         *,
         service_type: type[TService],
-        instance: TService,
+        implementation_type: type[TService] | None,
+        factory: Callable[..., TService] | None,
+        instance: TService | None,
         lifespan: Lifespan,
         name: str | None,
         dependency_config: DependencyConfig,
@@ -1145,56 +1461,37 @@ class _Registry:
         parent_node_filter: NodeFilter,
         scoped_teardown: Callable[[TService], Any] | None,
     ):
-        instance_lifespan = lifespan if lifespan == Lifespan.singleton else Lifespan.scoped
+        activator_class: type[Activator] = FactoryActivator
+        dependencies: dict[str, Dependency] | None = None
 
-        registration = _Registration(
-            activator_class=FactoryActivator,
-            service_type=service_type,
-            implementation=constant(instance),
-            lifespan=instance_lifespan,
-            name=name,
-            dependency_config=dependency_config,
-            parent_node_filter=parent_node_filter,
-            scoped_teardown=scoped_teardown,
-            tags=tags,
-        )
-        self._registrations[service_type].appendleft(registration)
+        if instance is not None:
+            implementation: Callable = constant(instance)
+            lifespan = lifespan if lifespan == Lifespan.singleton else Lifespan.scoped
+            # constant() takes no named arguments, so there is nothing to introspect
+            if not dependency_config:
+                dependencies = {}
+        elif factory is not None:
+            implementation = factory
+            activator_class = self._get_activator_class(factory)
+        else:
+            implementation = implementation_type or service_type
 
-    @classmethod
-    def _get_activator_class(cls, creator_function: Callable) -> type[Activator]:
-        if inspect.iscoroutinefunction(creator_function):
-            return AsyncFactoryActivator
-        if inspect.isasyncgenfunction(creator_function):
-            return AsyncGeneratorActivator
-        if inspect.isgeneratorfunction(creator_function):
-            return GeneratorActivator
-        return FactoryActivator
-
-    def register_factory(
-        self,
-        *,
-        service_type: type[TService],
-        factory: Callable[..., TService],
-        lifespan: Lifespan,
-        name: str | None,
-        dependency_config: DependencyConfig,
-        tags: Iterable[Tag] | None,
-        parent_node_filter: NodeFilter,
-        scoped_teardown: Callable[[TService], Any] | None,
-    ):
         registration = _Registration(
-            activator_class=self._get_activator_class(factory),
+            activator_class=activator_class,
             service_type=service_type,
-            implementation=factory,
+            implementation=implementation,
             lifespan=lifespan,
             name=name,
             dependency_config=dependency_config,
             parent_node_filter=parent_node_filter,
             scoped_teardown=scoped_teardown,
             tags=tags,
+            dependencies=dependencies,
         )
 
-        self._registrations[service_type].appendleft(registration)
+        self._add_registration(service_type, registration)
+        if implementation_type is not None and implementation is implementation_type:
+            self._add_registration(implementation_type, registration)
 
     def register_decorator(
         self,
@@ -1217,7 +1514,11 @@ class _Registry:
             dependency_config=dependency_config,
             position=position,
         )
-        self._decorators[service_type].add_decorator(decorator)
+        with self._write_lock:
+            decorator_store = self._decorators.get(service_type)
+            if decorator_store is None:
+                decorator_store = self._decorators[service_type] = _DecoratorStore()
+            decorator_store.add_decorator(decorator)
 
     def register_pre_configuration(
         self,
@@ -1238,55 +1539,73 @@ class _Registry:
 
         service_types = service_type if isinstance(service_type, Iterable) else (service_type,)
 
-        for st in service_types:
-            self._pre_configurations[st].appendleft(pre_configuration)
+        with self._write_lock:
+            for st in service_types:
+                self._pre_configurations[st] = (pre_configuration, *self._pre_configurations.get(st, ()))
+
+    def get_registrations(self, service_type: type) -> Sequence[_Registration]:
+        return self._registrations.get(service_type, ())
+
+    def get_unnamed_registrations(self, service_type: type) -> Sequence[_Registration]:
+        return self._unnamed_registrations.get(service_type, ())
+
+    def get_pre_configurations(self, service_type: type) -> Sequence[PreConfiguration]:
+        return self._pre_configurations.get(service_type, ())
+
+    def has_pre_configurations(self, service_type: type) -> bool:
+        return service_type in self._pre_configurations
 
-    def get_registrations(self, service_type: type):
-        return self._registrations[service_type]
+    def count_pre_configurations(self, service_type: type) -> int:
+        return len(self._pre_configurations.get(service_type, ()))
 
-    def get_pre_configurations(self, service_type: type):
-        return self._pre_configurations[service_type]
+    def has_decorators(self, service_type: type) -> bool:
+        return service_type in self._decorators
 
-    def get_decorators(self, service_type: type):
-        return self._decorators[service_type]
+    def count_decorators(self, service_type: type) -> int:
+        decorator_store = self._decorators.get(service_type)
+        return len(decorator_store) if decorator_store is not None else 0
+
+    def get_decorators(self, service_type: type) -> Sequence[Decorator]:
+        decorator_store = self._decorators.get(service_type)
+        return decorator_store.decorators if decorator_store is not None else ()
 
 
 class _DependencyCache:
+    __slots__ = ("scope", "_current_items")
+
     def __init__(self, scope: Scope):
         self.scope = scope
-        self._current_items: dict[str, DependencyNode] = {
-            **{k: v for k, v in scope.singleton_instances.items()},
-            **{k: v for k, v in scope.scoped_instances.items()},
-        }
+        self._current_items: dict[int, DependencyNode] = {}
 
-    def get(self, registration_id: str) -> DependencyNode | None:
-        node = self._current_items.get(registration_id)
-        if node:
-            return node
+    def get(self, registration_id: int) -> DependencyNode | None:
+        try:
+            return self._current_items[registration_id]
+        except KeyError:
+            pass
 
         node = self.scope.find_scoped_node(registration_id)
-        if node:
-            self._current_items[registration_id] = node
-            return node
+        if node is None:
+            node = self.scope.find_singleton_node(registration_id)
+            if node is None:
+                return None
 
-        node = self.scope.find_singleton_node(registration_id)
-        if node:
-            self._current_items[registration_id] = node
-            return node
-
-        return None
+        self._current_items[registration_id] = node
+        return node
 
     def put(self, registration: _Registration, dependency_node: DependencyNode):
-        if registration.lifespan == Lifespan.singleton:
+        if not registration.is_cached:
+            return
+
+        lifespan = registration.lifespan
+        if lifespan is Lifespan.singleton:
             self.scope.add_singleton_node(registration, dependency_node)
-        elif registration.lifespan == Lifespan.scoped:
+        elif lifespan is Lifespan.scoped:
             self.scope.add_scoped_node(
                 registration,
                 dependency_node,
             )
 
-        if registration.lifespan >= Lifespan.once_per_graph:
-            self._current_items[registration.id] = dependency_node
+        self._current_items[registration.id] = dependency_node
 
     def clean_up_parents(self):
         for node in self._current_items.values():
@@ -1297,8 +1616,16 @@ class _ResolvingContext:
     def __init__(self, scope: Scope):
         self.scope = scope
         self._cache = _DependencyCache(scope=scope)
+        self._registrations: dict[type, Sequence[_Registration]] = {}
+        self._unnamed_registrations: dict[type, Sequence[_Registration]] = {}
+        self._registration_decorators: dict[int, Sequence[Decorator]] = {}
+        self._registration_pre_configurations: dict[int, Sequence[PreConfiguration]] = {}
 
-    def try_generic_fallback(self, service_type: _GenericAlias, parent_node: DependencyNode):
+    def start_new_graph(self):
+        self._cache.clean_up_parents()
+        self._cache = _DependencyCache(scope=self.scope)
+
+    def try_generic_fallback(self, service_type: _GenericAlias, parent_node: DependencyNode) -> _Registration | None:
         return self.find_registration(
             service_type=service_type.__origin__,
             registration_filter=default_registration_filter,
@@ -1310,19 +1637,15 @@ class _ResolvingContext:
         service_type: type,
         registration_filter: Callable,
         parent_node: DependencyNode,
-    ) -> _Registration:
-        regs = self.find_registrations(
-            service_type=service_type,
-            registration_filter=registration_filter,
-            parent_node=parent_node,
-        )
-        reg = next(iter(regs), None)
+    ) -> _Registration | None:
+        if registration_filter is default_registration_filter:
+            unnamed_registrations = self._get_unnamed_registrations(service_type)
+            reg = _find_first_registration(unnamed_registrations, all_registrations, parent_node)
+        else:
+            reg = _find_first_registration(self._get_registrations(service_type), registration_filter, parent_node)
 
-        if reg is None:
-            if type(service_type) is _GenericAlias:
-                reg = self.try_generic_fallback(service_type, parent_node)
-            if reg is None:
-                raise CannotResolveError()
+        if reg is None and type(service_type) is _GenericAlias:
+            return self.try_generic_fallback(service_type, parent_node)
         return reg
 
     def find_registrations(
@@ -1331,29 +1654,63 @@ class _ResolvingContext:
         registration_filter: Callable[[_Registration], bool],
         parent_node: DependencyNode,
     ) -> list[_Registration]:
-        registrations = self.scope.find_registrations(
-            service_type=service_type, parent_node=parent_node, filter=registration_filter
-        )
+        if registration_filter is default_registration_filter:
+            return _filter_registrations(self._get_unnamed_registrations(service_type), all_registrations, parent_node)
+        return _filter_registrations(self._get_registrations(service_type), registration_filter, parent_node)
+
+    def _get_registrations(self, service_type: type) -> Sequence[_Registration]:
+        registrations = self._registrations.get(service_type)
+        if registrations is None:
+            registrations = self._registrations[service_type] = self.scope._get_registrations(service_type)
+        return registrations
+
+    def _get_unnamed_registrations(self, service_type: type) -> Sequence[_Registration]:
+        registrations = self._unnamed_registrations.get(service_type)
+        if registrations is None:
+            registrations = self._unnamed_registrations[service_type] = self.scope._get_unnamed_registrations(
+                service_type
+            )
         return registrations
 
     def find_decorators_that_apply(
         self, registration: _Registration, decorated_instance_node: DependencyNode
-    ) -> list[Decorator]:
-        return self.scope.find_decorators(registration=registration, decorated_instance_node=decorated_instance_node)
+    ) -> Sequence[Decorator]:
+        decorators = self._registration_decorators.get(registration.id)
+        if decorators is None:
+            decorators = self._registration_decorators[registration.id] = self.scope._get_registration_decorators(
+                registration
+            )
+
+        if not decorators:
+            return decorators
+
+        return [
+            d
+            for d in decorators
+            if d.has_default_decorated_node_filter or d.decorated_node_filter(decorated_instance_node)
+        ]
 
     def find_pre_configurations_that_apply(self, registration: _Registration):
-        return self.scope.find_pre_configurations(registration=registration)
+        pre_configurations = self._registration_pre_configurations.get(registration.id)
+        if pre_configurations is None:
+            pre_configurations = self._registration_pre_configurations[registration.id] = (
+                self.scope._get_registration_pre_configurations(registration)
+            )
+
+        if not pre_configurations:
+            return ()
+        return [c for c in pre_configurations if not c.has_run]
 
     def add_generator_finalizer(self, lifespan: Lifespan, generator: Callable):
         self.scope.add_generator_finalizer(lifespan, generator)
 
-    def get_cached(self, reg_id: str) -> DependencyNode | None:
+    def get_cached(self, reg_id: int) -> DependencyNode | None:
         return self._cache.get(reg_id)
 
     def new_instance_created(self, registration: _Registration, node: DependencyNode):
         self._cache.put(registration=registration, dependency_node=node)
 
-    def __del__(self):
+    def close(self):
         self._cache.clean_up_parents()
 
 
@@ -1398,12 +1755,21 @@ class Scope:
     def __init__(
         self,
     ):
-        self._id = str(uuid4())
+        self._id = _next_scope_id()
         self._registry = _Registry()
-        self._scoped_instances: dict[str, DependencyNode] = {}
-        self._sync_teardowns: dict[str, Callable] = {}
-        self._async_teardowns: dict[str, Callable] = {}
+        self._scoped_instances: dict[int, DependencyNode] = {}
+        self._sync_teardowns: dict[int, Callable] = {}
+        self._async_teardowns: dict[int, Callable] = {}
         self._generator_finalizers: deque[Callable] = deque()
+        # Registration filtered decorators and pre-configurations, keyed by registration id and
+        # tagged with the number of entries for the service type they were collected from
+        self._registration_decorators: dict[int, tuple[int, list[Decorator]]] = {}
+        self._registration_pre_configurations: dict[int, tuple[int, list[PreConfiguration]]] = {}
+        # Scoped and singleton instances resolved with the default filter, tagged with the registrations version
+        self._resolved_instances: dict[type, tuple[int, Any]] = {}
+        # Root dependencies only hold resolve settings, so default-filter graphs for a type share one.
+        # Child scopes use their container's, so entries live exactly as long as the container
+        self._root_dependencies: dict[type, Dependency] = {}
 
         self.register(ScopeCreator, instance=self)
         self.register(Resolver, instance=self)
@@ -1411,7 +1777,7 @@ class Scope:
         self.register(Scope, instance=self)
 
     @property
-    def id(self):
+    def id(self) -> int:
         return self._id
 
     def resolve(
@@ -1419,7 +1785,17 @@ class Scope:
         service_type: type[TService],
         filter: RegistrationFilter = default_registration_filter,
     ) -> TService:
+        if filter is not default_registration_filter:
+            return self.resolve_dependency_graph(service_type, filter).instance
+
+        # Read before resolving so a registration added meanwhile leaves the remembered instance stale
+        version = self._registrations_version()
+        instance = self._find_resolved_instance(service_type, version)
+        if instance is not EMPTY:
+            return instance
+
         graph = self.resolve_dependency_graph(service_type, filter)
+        self._remember_resolved_instance(graph, version)
         return graph.instance
 
     async def resolve_async(
@@ -1427,18 +1803,101 @@ class Scope:
         service_type: type[TService],
         filter: RegistrationFilter = default_registration_filter,
     ) -> TService:
+        if filter is not default_registration_filter:
+            return (await self.resolve_dependency_graph_async(service_type, filter)).instance
+
+        # Read before resolving so a registration added meanwhile leaves the remembered instance stale
+        version = self._registrations_version()
+        instance = self._find_resolved_instance(service_type, version)
+        if instance is not EMPTY:
+            return instance
+
         graph = await self.resolve_dependency_graph_async(service_type, filter)
+        self._remember_resolved_instance(graph, version)
         return graph.instance
 
+    def _registrations_version(self) -> int:
+        return self._registry.registrations_version
+
+    def _find_resolved_instance(self, service_type: type, version: int) -> Any:
+        try:
+            cached = self._resolved_instances.get(service_type)
+        except TypeError:
+            return EMPTY
+        if cached is None or cached[0] != version:
+            return EMPTY
+        return cached[1]
+
+    def _remember_resolved_instance(self, graph: DependencyGraph, version: int):
+        # Only a single scoped or singleton instance will be handed back again by a later resolve,
+        # as long as no registration has been added since
+        if graph.root_dependency.resolve_mode != _RESOLVE_SINGLE or not graph.children:
+            return
+        if graph.children[0].bottom_decorated_node.lifespan < Lifespan.scoped:
+            return
+        try:
+            self._resolved_instances[graph.service_type] = (version, graph.instance)
+        except TypeError:
+            pass
+
+    def _new_dependency_graph(self, service_type: type, filter: RegistrationFilter) -> DependencyGraph:
+        if filter is not default_registration_filter:
+            # Custom filters are usually built per call, caching them would only pin them in memory
+            return DependencyGraph(service_type=service_type, filter=filter)
+
+        try:
+            root_dependency = self._root_dependencies.get(service_type)
+        except TypeError:
+            # Unhashable service types can't be cached
+            return DependencyGraph(service_type=service_type, filter=filter)
+
+        if root_dependency is None:
+            root_dependency = self._root_dependencies[service_type] = _create_root_dependency(service_type, filter)
+        return DependencyGraph(service_type=service_type, filter=filter, root_dependency=root_dependency)
+
+    def resolve_many(
+        self,
+        service_types: Iterable[type],
+        filter: RegistrationFilter = default_registration_filter,
+    ) -> list[Any]:
+        context = _ResolvingContext(self)
+        instances = []
+        try:
+            for service_type in service_types:
+                context.start_new_graph()
+                graph = self._new_dependency_graph(service_type, filter)
+                instances.append(graph.resolve(context).instance)
+        finally:
+            context.close()
+        return instances
+
+    async def resolve_many_async(
+        self,
+        service_types: Iterable[type],
+        filter: RegistrationFilter = default_registration_filter,
+    ) -> list[Any]:
+        context = _ResolvingContext(self)
+        instances = []
+        try:
+            for service_type in service_types:
+                context.start_new_graph()
+                graph = self._new_dependency_graph(service_type, filter)
+                instances.append((await graph.resolve_async(context)).instance)
+        finally:
+            context.close()
+        return instances
+
     def resolve_dependency_graph(
         self,
         service_type: type,
         filter: RegistrationFilter = default_registration_filter,
     ) -> DependencyGraph:
-        graph = DependencyGraph(service_type=service_type, filter=filter)
+        graph = self._new_dependency_graph(service_type, filter)
         context = _ResolvingContext(self)
-        graph.resolve(context)
-        del context
+        try:
+            graph.resolve(context)
+        finally:
+            context.close()
         return graph
 
     async def resolve_dependency_graph_async(
@@ -1446,10 +1905,12 @@ class Scope:
         service_type: type,
         filter: RegistrationFilter = default_registration_filter,
     ) -> DependencyGraph:
-        graph = DependencyGraph(service_type=service_type, filter=filter)
+        graph = self._new_dependency_graph(service_type, filter)
         context = _ResolvingContext(self)
-        await graph.resolve_async(context)
-        del context
+        try:
+            await graph.resolve_async(context)
+        finally:
+            context.close()
         return graph
 
     def register(
@@ -1466,49 +1927,18 @@ class Scope:
         parent_node_filter: NodeFilter = default_parent_node_filter,
         scoped_teardown: Callable[[TService], Any] | None = None,
     ) -> Scope:
-        if instance is not None:
-            self._registry.register_instance(
-                service_type=service_type,
-                instance=instance,
-                lifespan=lifespan,
-                name=name,
-                tags=tags,
-                dependency_config=dependency_config,
-                parent_node_filter=parent_node_filter,
-                scoped_teardown=scoped_teardown,
-            )
-        elif factory is not None:
-            self._registry.register_factory(
-                service_type=service_type,
-                factory=factory,
-                lifespan=lifespan,
-                name=name,
-                tags=tags,
-                dependency_config=dependency_config,
-                parent_node_filter=parent_node_filter,
-                scoped_teardown=scoped_teardown,
-            )
-        elif implementation_type is not None:
-            self._registry.register_implementation(
-                service_type=service_type,
-                implementation=implementation_type,
-                lifespan=lifespan,
-                name=name,
-                tags=tags,
-                dependency_config=dependency_config,
-                parent_node_filter=parent_node_filter,
-                scoped_teardown=scoped_teardown,
-            )
-        else:
-            self._registry.register_concrete(
-                service_type=service_type,
-                lifespan=lifespan,
-                name=name,
-                tags=tags,
-                dependency_config=dependency_config,
-                parent_node_filter=parent_node_filter,
-                scoped_teardown=scoped_teardown,
-            )
+        self._registry.register(
+            service_type=service_type,
+            implementation_type=implementation_type,
+            factory=factory,
+            instance=instance,
+            lifespan=lifespan,
+            name=name,
+            dependency_config=dependency_config,
+            tags=tags,
+            parent_node_filter=parent_node_filter,
+            scoped_teardown=scoped_teardown,
+        )
 
         return self
 
@@ -1556,9 +1986,9 @@ class Scope:
 
     def add_singleton_node(self, registration: _Registration, node: DependencyNode) -> Scope: ...
 
-    def find_singleton_node(self, registration_id: str) -> DependencyNode | None: ...
+    def find_singleton_node(self, registration_id: int) -> DependencyNode | None: ...
 
-    def find_scoped_node(self, registration_id: str) -> DependencyNode | None:
+    def find_scoped_node(self, registration_id: int) -> DependencyNode | None:
         return self._scoped_instances.get(registration_id)
 
     def find_registrations(
@@ -1568,25 +1998,75 @@ class Scope:
         filter: RegistrationFilter = default_registration_filter,
         parent_node: Node,
     ) -> list[_Registration]:
-        return [
-            r for r in self._registry.get_registrations(service_type) if filter(r) and r.parent_node_filter(parent_node)
-        ]
+        return _filter_registrations(self._get_registrations(service_type), filter, parent_node)
+
+    def _get_registrations(self, service_type) -> Sequence[_Registration]:
+        return self._registry.get_registrations(service_type)
+
+    def _get_unnamed_registrations(self, service_type) -> Sequence[_Registration]:
+        return self._registry.get_unnamed_registrations(service_type)
 
     def find_decorators(
         self, *, registration: _Registration, decorated_instance_node: DependencyNode
     ) -> list[Decorator]:
-        return [
-            d
-            for d in self._registry.get_decorators(registration.service_type)
-            if d.registration_filter(registration) and d.decorated_node_filter(decorated_instance_node)
-        ]
+        decorators: list[Decorator] = []
+        self._collect_decorators(decorators, registration)
+        return [d for d in decorators if d.decorated_node_filter(decorated_instance_node)]
+
+    def _decorators_version(self, service_type: type) -> int:
+        return self._registry.count_decorators(service_type)
+
+    def _get_registration_decorators(self, registration: _Registration) -> Sequence[Decorator]:
+        if not self._registry.has_decorators(registration.service_type):
+            return ()
+
+        version = self._decorators_version(registration.service_type)
+        cached = self._registration_decorators.get(registration.id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        decorators: list[Decorator] = []
+        self._collect_decorators(decorators, registration)
+        self._registration_decorators[registration.id] = (version, decorators)
+        return decorators
+
+    def _collect_decorators(self, decorators: list[Decorator], registration: _Registration):
+        for d in self._registry.get_decorators(registration.service_type):
+            if _matches_registration_filter(d.registration_filter, registration):
+                decorators.append(d)
 
     def find_pre_configurations(self, *, registration: _Registration):
-        return [
-            c
-            for c in self._registry.get_pre_configurations(registration.service_type)
-            if not c.has_run and c.registration_filter(registration)
-        ]
+        pre_configurations: list[PreConfiguration] = []
+        self._collect_pre_configurations(pre_configurations, registration)
+        return [c for c in pre_configurations if not c.has_run]
+
+    def _pre_configurations_version(self, service_type: type) -> int:
+        return self._registry.count_pre_configurations(service_type)
+
+    def _get_registration_pre_configurations(self, registration: _Registration) -> Sequence[PreConfiguration]:
+        if not self._registry.has_pre_configurations(registration.service_type):
+            return ()
+
+        version = self._pre_configurations_version(registration.service_type)
+        cached = self._registration_pre_configurations.get(registration.id)
+        if cached is not None and cached[0] == version:
+            pre_configurations = cached[1]
+            # A pre-configuration only ever runs once, so prune the ones that have from the cached list
+            if any(c.has_run for c in pre_configurations):
+                pre_configurations = [c for c in pre_configurations if not c.has_run]
+                self._registration_pre_configurations[registration.id] = (version, pre_configurations)
+            return pre_configurations
+
+        pre_configurations = []
+        self._collect_pre_configurations(pre_configurations, registration)
+        pre_configurations = [c for c in pre_configurations if not c.has_run]
+        self._registration_pre_configurations[registration.id] = (version, pre_configurations)
+        return pre_configurations
+
+    def _collect_pre_configurations(self, pre_configurations: list[PreConfiguration], registration: _Registration):
+        for c in self._registry.get_pre_configurations(registration.service_type):
+            if _matches_registration_filter(c.registration_filter, registration):
+                pre_configurations.append(c)
 
     async def __aenter__(self):
         return self
@@ -1640,11 +2120,11 @@ class Scope:
         return self
 
     @property
-    def scoped_instances(self) -> dict[str, DependencyNode]:
+    def scoped_instances(self) -> dict[int, DependencyNode]:
         return self._scoped_instances
 
     @property
-    def singleton_instances(self) -> dict[str, DependencyNode]: ...
+    def singleton_instances(self) -> dict[int, DependencyNode]: ...
 
     def new_scope(self) -> Scope: ...
 
@@ -1653,6 +2133,7 @@ class ChildScope(Scope):
     def __init__(self, parent_scope: Scope):
         super().__init__()
         self._parent_scope = parent_scope
+        self._root_dependencies = parent_scope._root_dependencies
 
     def add_singleton_node(
         self,
@@ -1662,35 +2143,55 @@ class ChildScope(Scope):
         self._parent_scope.add_singleton_node(registration, node)
         return self
 
-    def find_singleton_node(self, registration_id: str) -> DependencyNode | None:
+    def find_singleton_node(self, registration_id: int) -> DependencyNode | None:
         return self._parent_scope.find_singleton_node(registration_id)
 
-    def find_scoped_node(self, registration_id: str) -> DependencyNode | None:
-        if scoped_node := super().find_scoped_node(registration_id):
+    def find_scoped_node(self, registration_id: int) -> DependencyNode | None:
+        if (scoped_node := super().find_scoped_node(registration_id)) is not None:
             return scoped_node
         return self._parent_scope.find_scoped_node(registration_id)
 
-    def find_registrations(
-        self, *, service_type, filter: Callable[[_Registration], bool] = default_registration_filter, parent_node: Node
-    ) -> list[_Registration]:
-        registrations = super().find_registrations(service_type=service_type, filter=filter, parent_node=parent_node)
-        from_parent = self._parent_scope.find_registrations(
-            service_type=service_type, filter=filter, parent_node=parent_node
+    def _get_registrations(self, service_type) -> Sequence[_Registration]:
+        return _chain_registrations(
+            super()._get_registrations(service_type), self._parent_scope._get_registrations(service_type)
         )
-        return registrations + from_parent
 
-    def find_decorators(
-        self, *, registration: _Registration, decorated_instance_node: DependencyNode
-    ) -> list[Decorator]:
-        decorators = super().find_decorators(registration=registration, decorated_instance_node=decorated_instance_node)
+    def _get_unnamed_registrations(self, service_type) -> Sequence[_Registration]:
+        return _chain_registrations(
+            super()._get_unnamed_registrations(service_type),
+            self._parent_scope._get_unnamed_registrations(service_type),
+        )
+
+    def _registrations_version(self) -> int:
+        return self._registry.registrations_version + self._parent_scope._registrations_version()
+
+    # Decorators and pre-configurations are only ever added, so the count along the
+    # scope chain changes whenever one is added for the service type
+    def _decorators_version(self, service_type: type) -> int:
+        return self._registry.count_decorators(service_type) + self._parent_scope._decorators_version(service_type)
 
-        return decorators + self._parent_scope.find_decorators(
-            registration=registration, decorated_instance_node=decorated_instance_node
+    def _pre_configurations_version(self, service_type: type) -> int:
+        return self._registry.count_pre_configurations(service_type) + self._parent_scope._pre_configurations_version(
+            service_type
         )
 
-    def find_pre_configurations(self, *, registration: _Registration):
-        pre_configurations = super().find_pre_configurations(registration=registration)
-        return pre_configurations + self._parent_scope.find_pre_configurations(registration=registration)
+    def _get_registration_decorators(self, registration: _Registration) -> Sequence[Decorator]:
+        if not self._registry.has_decorators(registration.service_type):
+            return self._parent_scope._get_registration_decorators(registration)
+        return super()._get_registration_decorators(registration)
+
+    def _get_registration_pre_configurations(self, registration: _Registration) -> Sequence[PreConfiguration]:
+        if not self._registry.has_pre_configurations(registration.service_type):
+            return self._parent_scope._get_registration_pre_configurations(registration)
+        return super()._get_registration_pre_configurations(registration)
+
+    def _collect_decorators(self, decorators: list[Decorator], registration: _Registration):
+        super()._collect_decorators(decorators, registration)
+        self._parent_scope._collect_decorators(decorators, registration)
+
+    def _collect_pre_configurations(self, pre_configurations: list[PreConfiguration], registration: _Registration):
+        super()._collect_pre_configurations(pre_configurations, registration)
+        self._parent_scope._collect_pre_configurations(pre_configurations, registration)
 
     def add_generator_finalizer(self, lifespan: Lifespan, generator: Callable) -> ChildScope:
         if lifespan == Lifespan.singleton:
@@ -1701,7 +2202,7 @@ class ChildScope(Scope):
         return self
 
     @property
-    def singleton_instances(self) -> dict[str, DependencyNode]:
+    def singleton_instances(self) -> dict[int, DependencyNode]:
         return self._parent_scope.singleton_instances
 
     def new_scope(self) -> Scope:
@@ -1725,10 +2226,16 @@ def type_expected_to_be_scoped(service_type: type, name: str | None):
     return raise_error
 
 
+# Target generic bases per subclass, keyed weakly so subclasses defined at runtime can still be collected
+_TARGET_GENERIC_BASE_CACHE: weakref.WeakKeyDictionary[Callable, dict[type, Any]] = weakref.WeakKeyDictionary()
+
+
 class Container(Scope):
     def __init__(self):
         super().__init__()
-        self._singletons: dict[str, DependencyNode] = {}
+        self._singletons: dict[int, DependencyNode] = {}
+        # One factory per (service type, name), kept with the container whose registrations already hold the type
+        self._expected_to_be_scoped_factories: dict[tuple[type, str | None], Callable] = {}
         self.register(Container, instance=self)
 
     def register_subclasses(
@@ -1741,7 +2248,7 @@ class Container(Scope):
         tags: list[Tag] | None = None,
         parent_node_filter: NodeFilter = default_parent_node_filter,
     ):
-        full_type_filter = ~(is_abstract) & subclass_type_filter
+        full_type_filter = _concrete_subclass_filter(subclass_type_filter)
         subclasses = get_subclasses(base_type, filter=full_type_filter)
         for sc in subclasses:
             self.register(
@@ -1755,16 +2262,20 @@ class Container(Scope):
 
     @staticmethod
     def _get_target_generic_base(generic_service_type: type, subclass: type):
-        return next(
-            (
-                try_to_complete_generic(b, subclass)
-                for b in get_generic_bases(
-                    subclass,
-                    lambda t: getattr(t, "__origin__", None) == generic_service_type,
-                )
-            ),
-            None,
-        )
+        target_generic_bases = _get_cached_for_callable(_TARGET_GENERIC_BASE_CACHE, subclass, dict)
+        target_generic_base = target_generic_bases.get(generic_service_type, EMPTY)
+        if target_generic_base is EMPTY:
+            target_generic_base = target_generic_bases[generic_service_type] = next(
+                (
+                    try_to_complete_generic(b, subclass)
+                    for b in get_generic_bases(
+                        subclass,
+                        lambda t: getattr(t, "__origin__", None) == generic_service_type,
+                    )
+                ),
+                None,
+            )
+        return target_generic_base
 
     def register_generic_subclasses(
         self,
@@ -1777,7 +2288,7 @@ class Container(Scope):
         tags: list[Tag] | None = None,
         parent_node_filter: NodeFilter = default_parent_node_filter,
     ) -> Container:
-        full_type_filter = ~is_abstract & subclass_type_filter
+        full_type_filter = _concrete_subclass_filter(subclass_type_filter)
         subclasses = get_subclasses(generic_service_type, filter=full_type_filter)
         for subclass in subclasses:
             target_generic_base = self._get_target_generic_base(generic_service_type, subclass)
@@ -1815,7 +2326,7 @@ class Container(Scope):
         decorated_node_filter: NodeFilter = default_decorated_node_filter,
         position: int = 0,
     ) -> Container:
-        full_type_filter = ~is_abstract & ~name_starts_with("__DecoratedGeneric__") & subclass_type_filter
+        full_type_filter = _is_not_abstract & _is_not_decorated_generic & subclass_type_filter
         subclasses = get_subclasses(generic_service_type, filter=full_type_filter)
         decorator_is_open_generic = is_generic_type_open(generic_decorator_type)
 
@@ -1864,9 +2375,15 @@ class Container(Scope):
         await self.resolve_async(service_type, filter=registration_filter)
 
     def expect_to_be_scoped(self, service_type: type, name: str | None = None) -> Container:
+        factory = self._expected_to_be_scoped_factories.get((service_type, name))
+        if factory is None:
+            factory = self._expected_to_be_scoped_factories[(service_type, name)] = type_expected_to_be_scoped(
+                service_type, name
+            )
+
         self.register(
             service_type=service_type,
-            factory=type_expected_to_be_scoped(service_type, name),
+            factory=factory,
             name=name,
         )
         return self
@@ -1880,8 +2397,14 @@ class Container(Scope):
         return self
 
     def has_registration(self, service_type, filter: RegistrationFilter = default_registration_filter):
-        found_registrations = [r for r in self._registry.get_registrations(service_type) if filter(r)]
-        return len(found_registrations) > 0
+        if filter is default_registration_filter:
+            return len(self._registry.get_unnamed_registrations(service_type)) > 0
+
+        registrations = self._registry.get_registrations(service_type)
+        if filter is all_registrations:
+            return len(registrations) > 0
+
+        return any(filter(r) for r in registrations)
 
     def add_singleton_node(
         self,
@@ -1892,24 +2415,35 @@ class Container(Scope):
 
         return self
 
-    def find_singleton_node(self, registration_id: str) -> DependencyNode | None:
+    def find_singleton_node(self, registration_id: int) -> DependencyNode | None:
         return self._singletons.get(registration_id)
 
     @property
-    def singleton_instances(self) -> dict[str, DependencyNode]:
+    def singleton_instances(self) -> dict[int, DependencyNode]:
         return self._singletons
 
     def new_scope(self) -> Scope:
         return ChildScope(self)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True, frozen=True)
 class DependencySettings:
     value_factory: ParameterValueFactory = default_parameter_value_factory
     filter: RegistrationFilter = default_registration_filter
 
 
+# Settings are frozen, so the all defaults case can share one instance
+_DEFAULT_DEPENDENCY_SETTINGS = DependencySettings()
+
+
+def _dependency_settings_with_filter(filter: RegistrationFilter) -> DependencySettings:
+    if filter is default_registration_filter:
+        return _DEFAULT_DEPENDENCY_SETTINGS
+    return DependencySettings(filter=filter)
+
+
 DependencyConfig = dict[str, DependencySettings]
+DependencyResolver = Callable[[_ResolvingContext, DependencyNode], Any]
 RegistrationFilter = Callable[[_Registration], bool]
 NodeFilter = Callable[[Node], bool]
 ParameterValueFactory = Callable[[Any, DependencyContext], Any]
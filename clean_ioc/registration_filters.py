@@ -3,11 +3,9 @@ from collections.abc import Iterable
 from typing import Callable, TypeVar
 
 from theutilitybelt.functional.predicate import predicate
-from theutilitybelt.functional.utils import constant
 
 from .core import Lifespan, Registration
-
-all_registrations = constant(True)
+from .core import all_registrations as all_registrations
 
 
 def create_filter(func: Callable[[Registration], bool]):
@@ -1,5 +1,9 @@
 import functools
 import warnings
+from collections import deque
+from collections.abc import Callable
+
+from theutilitybelt.functional.predicate import always_true
 
 
 def send_deprecation_warning(message: str):
@@ -55,3 +59,22 @@ def singleton(cls):
     cls.__new__ = singleton_new
 
     return cls
+
+
+def get_subclasses(cls: type, *, filter: Callable[[type], bool] = always_true) -> list[type]:
+    """
+    Retrieves all subclasses of a given class, breadth first.
+    Classes reachable through more than one base are returned once per base.
+    """
+    pending = deque([cls])
+    items = []
+    while pending:
+        t = pending.popleft()
+
+        for sub in t.__subclasses__():
+            pending.append(sub)
+
+            if filter(sub):
+                items.append(sub)
+
+    return items
@@ -11,6 +11,7 @@ from assertive import (
 from clean_ioc import (
     Container,
 )
+from clean_ioc.factories import use_from_current_graph_async
 
 
 @pytest.mark.asyncio
@@ -151,3 +152,50 @@ async def test_async_returns_a_list():
     arr = await container.resolve_async(list[int])
 
     assert_that(arr).matches([10, 5])
+
+
+@pytest.mark.asyncio
+async def test_async_using_current_graph_finds_dependencies_from_within():
+    class A:
+        pass
+
+    class B:
+        pass
+
+    class AB(A, B):
+        pass
+
+    class C:
+        def __init__(self, a: A, b: B):
+            self.a = a
+            self.b = b
+
+    container = Container()
+
+    container.register(A, AB)
+    container.register(B, factory=use_from_current_graph_async(AB))
+    container.register(C)
+    c = await container.resolve_async(C)
+
+    assert c.a is c.b
+
+
+@pytest.mark.asyncio
+async def test_resolve_many_async():
+    class A:
+        pass
+
+    class B:
+        pass
+
+    async def a_factory():
+        return A()
+
+    container = Container()
+    container.register(A, factory=a_factory)
+    container.register(B)
+
+    a, b = await container.resolve_many_async([A, B])
+
+    assert_that(a).matches(is_exact_type(A))
+    assert_that(b).matches(is_exact_type(B))
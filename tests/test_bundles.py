@@ -1,6 +1,8 @@
+import gc
+import weakref
 from unittest.mock import Mock
 
-from assertive import assert_that, was_called, was_called_once, was_called_once_with, was_not_called
+from assertive import assert_that, is_none, was_called, was_called_once, was_called_once_with, was_not_called
 
 from clean_ioc import Container
 from clean_ioc.bundles import (
@@ -167,3 +169,71 @@ def test_custom_run_once_bundle():
     assert_that(spy1).matches(was_called_once())
     assert_that(spy2).matches(was_called_once())
     assert_that(spy3).matches(was_not_called())
+
+
+def test_run_once_bundles_with_the_same_identifier_share_their_run_history():
+    applied = []
+
+    class A(OnlyRunOncePerClassBundle):
+        def apply(self, container: Container):
+            applied.append("A")
+
+        def get_bundle_identifier(self) -> str:
+            return "shared-db"
+
+    class B(OnlyRunOncePerClassBundle):
+        def apply(self, container: Container):
+            applied.append("B")
+
+        def get_bundle_identifier(self) -> str:
+            return "shared-db"
+
+    container = Container()
+
+    container.apply_bundle(A())
+    container.apply_bundle(B())
+
+    assert_that(applied).matches(["A"])
+
+
+def test_bundle_apply_receives_the_container_positionally():
+    spy = Mock()
+
+    class TestBundle(OnlyRunOncePerClassBundle):
+        def apply(self, container: Container):
+            spy(container)
+
+    container = Container()
+    container.apply_bundle(TestBundle())
+
+    assert_that(spy).matches(was_called_once_with(container))
+
+
+def test_run_once_bundle_history_does_not_keep_containers_alive():
+    class TestBundle(OnlyRunOncePerClassBundle):
+        def apply(self, container: Container):
+            pass
+
+    container = Container()
+    container.apply_bundle(TestBundle())
+    container_ref = weakref.ref(container)
+
+    del container
+    gc.collect()
+
+    assert_that(container_ref()).matches(is_none())
+
+
+def test_run_once_bundle_history_does_not_keep_bundle_classes_alive():
+    class TestBundle(OnlyRunOncePerClassBundle):
+        def apply(self, container: Container):
+            pass
+
+    container = Container()
+    container.apply_bundle(TestBundle())
+    bundle_class_ref = weakref.ref(TestBundle)
+
+    del TestBundle
+    gc.collect()
+
+    assert_that(bundle_class_ref()).matches(is_none())
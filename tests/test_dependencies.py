@@ -1,7 +1,10 @@
 # from __future__ import annotations
+import gc
+import typing
+import weakref
 from collections.abc import MutableSequence, Sequence
 from datetime import datetime
-from typing import Any, Callable, Generic, Protocol, TypeVar
+from typing import Any, Callable, Generic, Protocol, TypeVar, cast
 from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
@@ -10,6 +13,7 @@ from assertive import (
     has_length,
     is_exact_type,
     is_gt,
+    is_none,
     is_same_instance_as,
     raises_exception,
     was_called,
@@ -23,11 +27,13 @@ from clean_ioc import (
     DependencySettings,
     Lifespan,
     NeedsScopedRegistrationError,
+    Registration,
     Tag,
 )
 from clean_ioc.factories import use_from_current_graph
 from clean_ioc.node_filters import implementation_type_is
 from clean_ioc.registration_filters import (
+    all_registrations,
     has_tag,
     has_tag_with_value_in,
     with_implementation,
@@ -109,6 +115,20 @@ def test_simple_self_registation():
     assert_that(a).matches(is_exact_type(A))
 
 
+def test_singleton_is_reused_when_the_instance_is_falsy():
+    class EmptyCollection:
+        def __len__(self):
+            return 0
+
+    container = Container()
+    container.register(EmptyCollection, lifespan=Lifespan.singleton)
+
+    first = container.resolve(EmptyCollection)
+    second = container.resolve(EmptyCollection)
+
+    assert_that(first).matches(is_same_instance_as(second))
+
+
 def test_list():
     class A:
         pass
@@ -239,6 +259,27 @@ def test_list_with_named_filter():
     assert_that(array[1]).matches(is_same_instance_as(a1))
 
 
+def test_list_with_all_registrations_filter_includes_named():
+    class A:
+        pass
+
+    container = Container()
+
+    a1 = A()
+    a2 = A()
+
+    container.register(A, instance=a1)
+    container.register(A, instance=a2, name="NAMED")
+
+    array = container.resolve(list[A], filter=all_registrations)
+    a = container.resolve(A, filter=all_registrations)
+
+    assert_that(array).matches(has_length(2))
+    assert_that(array[0]).matches(is_same_instance_as(a2))
+    assert_that(array[1]).matches(is_same_instance_as(a1))
+    assert_that(a).matches(is_same_instance_as(a2))
+
+
 def test_different_collection_types():
     class A:
         pass
@@ -347,6 +388,57 @@ def test_simple_decorator():
     assert_that(a).matches(is_exact_type(DecA))
 
 
+def test_decorator_registered_after_a_resolve_is_applied():
+    class A:
+        pass
+
+    class DecA(A):
+        def __init__(self, a: A):
+            self.a = a
+
+    container = Container()
+    container.register(A)
+
+    undecorated = container.resolve(A)
+    container.register_decorator(A, DecA)
+
+    with container.new_scope() as scope:
+        scope.register_decorator(A, DecA)
+        from_scope = cast(DecA, scope.resolve(A))
+
+    decorated = container.resolve(A)
+
+    assert_that(undecorated).matches(is_exact_type(A))
+    assert_that(decorated).matches(is_exact_type(DecA))
+    assert_that(from_scope.a).matches(is_exact_type(DecA))
+
+
+def test_singleton_registered_after_a_resolve_replaces_the_resolved_instance():
+    class A:
+        pass
+
+    class B(A):
+        pass
+
+    container = Container()
+    container.register(A, lifespan=Lifespan.singleton)
+
+    first = container.resolve(A)
+    second = container.resolve(A)
+
+    with container.new_scope() as scope:
+        from_scope_before = scope.resolve(A)
+        container.register(A, B, lifespan=Lifespan.singleton)
+        from_scope_after = scope.resolve(A)
+
+    replaced = container.resolve(A)
+
+    assert_that(second).matches(is_same_instance_as(first))
+    assert_that(from_scope_before).matches(is_same_instance_as(first))
+    assert_that(from_scope_after).matches(is_exact_type(B))
+    assert_that(replaced).matches(is_same_instance_as(from_scope_after))
+
+
 def test_decorator_with_decorated_arg_set():
     class A:
         pass
@@ -365,6 +457,26 @@ def test_decorator_with_decorated_arg_set():
     assert_that(a).matches(is_exact_type(DecAny))
 
 
+def test_decorator_type_can_also_be_registered_as_a_service():
+    class A:
+        pass
+
+    class Wrapper:
+        def __init__(self, a: A):
+            self.a = a
+
+    container = Container()
+
+    container.register(A)
+    container.register_decorator(A, Wrapper)
+    container.register(Wrapper)
+
+    wrapper = container.resolve(Wrapper)
+
+    assert_that(wrapper.a).matches(is_exact_type(Wrapper))
+    assert_that(cast(Wrapper, wrapper.a).a).matches(is_exact_type(A))
+
+
 def test_simple_open_generic():
     T = TypeVar("T")
 
@@ -538,6 +650,27 @@ def test_open_generic_decorators_with_both_generic_and_nongeneric_decorator():
     assert_that(type(a.a.a).__name__).matches("B")  # type: ignore
 
 
+def test_default_value_with_custom_equality_is_used():
+    class Settings:
+        def __eq__(self, other):
+            raise TypeError("Settings cannot be compared")
+
+        __hash__ = object.__hash__
+
+    default_settings = Settings()
+
+    class A:
+        def __init__(self, settings: Settings = default_settings):
+            self.settings = settings
+
+    container = Container()
+    container.register(A)
+
+    a = container.resolve(A)
+
+    assert_that(a.settings).matches(is_same_instance_as(default_settings))
+
+
 def test_deep_dependencies_with_dependency_settings():
     class A:
         def __init__(self, s: str = "Hello"):
@@ -1512,3 +1645,218 @@ def test_using_current_graph_finds_dependencies_from_within():
     c = container.resolve(C)
 
     assert c.a is c.b
+
+
+def test_resolve_many_resolves_each_service_in_its_own_graph():
+    class A:
+        pass
+
+    class B:
+        def __init__(self, a: A):
+            self.a = a
+
+    class C:
+        def __init__(self, a: A):
+            self.a = a
+
+    container = Container()
+    container.register(A, lifespan=Lifespan.once_per_graph)
+    container.register(B)
+    container.register(C)
+
+    b, c = container.resolve_many([B, C])
+
+    assert_that(b).matches(is_exact_type(B))
+    assert_that(c).matches(is_exact_type(C))
+    assert_that(b.a).does_not_match(is_same_instance_as(c.a))
+
+
+def test_register_subclasses_registers_diamond_subclasses_once_per_base():
+    class A:
+        pass
+
+    class B(A):
+        pass
+
+    class C(A):
+        pass
+
+    class D(B, C):
+        pass
+
+    container = Container()
+    container.register_subclasses(A)
+
+    items = container.resolve(list[A])
+
+    assert_that([type(i) for i in items]).matches([D, D, C, B])
+
+
+def test_collection_annotations_without_an_item_type_use_their_default_value():
+    class A:
+        def __init__(
+            self,
+            items: typing.List = [1],
+            sequence: typing.Sequence = (2,),
+            empty: tuple[()] = (),
+        ):
+            self.items = items
+            self.sequence = sequence
+            self.empty = empty
+
+    container = Container()
+    container.register(A)
+
+    a = container.resolve(A)
+
+    assert_that(a.items).matches([1])
+    assert_that(a.sequence).matches((2,))
+    assert_that(a.empty).matches(())
+
+
+def test_shared_generic_mappings_are_read_only():
+    T = TypeVar("T")
+
+    class A(Generic[T]):
+        pass
+
+    class B(A[int]):
+        pass
+
+    registrations = []
+
+    def capture(r: Registration):
+        registrations.append(r)
+        return True
+
+    container = Container()
+    container.register(A[int], B)
+    container.has_registration(A[int], filter=capture)
+
+    mapping = registrations[0].generic_mapping
+
+    assert_that(mapping[T]).matches(int)
+    with raises_exception(TypeError):
+        mapping[T] = str
+    assert_that(mapping[T]).matches(int)
+
+
+def test_registering_a_class_does_not_keep_it_alive():
+    class A:
+        pass
+
+    class B:
+        def __init__(self, a: A):
+            self.a = a
+
+    container = Container()
+    container.register(A)
+    container.register(B)
+    b_ref = weakref.ref(B)
+
+    del container, B
+    gc.collect()
+
+    assert_that(b_ref()).matches(is_none())
+
+
+def test_resolving_a_class_does_not_keep_it_alive():
+    class A:
+        pass
+
+    class B:
+        def __init__(self, a: A):
+            self.a = a
+
+    container = Container()
+    container.register(A)
+    container.register(B)
+    with container.new_scope() as scope:
+        scope.resolve(B)
+    b_ref = weakref.ref(B)
+
+    del container, scope, B
+    gc.collect()
+
+    assert_that(b_ref()).matches(is_none())
+
+
+def test_registering_a_generic_class_does_not_keep_it_alive():
+    T = TypeVar("T")
+
+    class Repository(Generic[T]):
+        pass
+
+    class Service(Generic[T]):
+        def __init__(self, repository: Repository[T]):
+            self.repository = repository
+
+    container = Container()
+    container.register(Service)
+    service_ref = weakref.ref(Service)
+
+    del container, Service
+    gc.collect()
+
+    assert_that(service_ref()).matches(is_none())
+
+
+def test_reading_a_generic_mapping_does_not_keep_the_class_alive():
+    T = TypeVar("T")
+
+    class A(Generic[T]):
+        pass
+
+    class B(A[int]):
+        pass
+
+    container = Container()
+    container.register(A[int], B)
+    container.register(B)
+    container.has_registration(B, filter=lambda r: r.generic_mapping.get(T) is int)
+    b_ref = weakref.ref(B)
+
+    del container, B
+    gc.collect()
+
+    assert_that(b_ref()).matches(is_none())
+
+
+def test_registering_generic_subclasses_does_not_keep_them_alive():
+    T = TypeVar("T")
+
+    class A(Generic[T]):
+        pass
+
+    class B(A[int]):
+        pass
+
+    container = Container()
+    container.register_generic_subclasses(A)
+    b_ref = weakref.ref(B)
+
+    del container, B
+    gc.collect()
+
+    assert_that(b_ref()).matches(is_none())
+
+
+def test_expecting_a_class_to_be_scoped_does_not_keep_it_alive():
+    class A:
+        pass
+
+    container = Container()
+    container.expect_to_be_scoped(A)
+    a_ref = weakref.ref(A)
+
+    del container, A
+    gc.collect()
+
+    assert_that(a_ref()).matches(is_none())
+
+
+def test_dependency_settings_cannot_be_changed():
+    settings = DependencySettings()
+
+    with raises_exception(AttributeError):
+        settings.filter = with_name("other")  # type: ignore